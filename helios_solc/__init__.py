@@ -13,6 +13,7 @@ from .main import (  # noqa: F401
 )
 from .install import (  # noqa: F401
     install_solc,
+    install_solc_many,
 )
 
 if sys.version_info.major < 3:
@@ -1,11 +1,12 @@
 import textwrap
 
-from .utils.string import force_text
+from .utils.types import is_bytes
 
 
-def force_text_maybe(value, encoding='iso-8859-1'):
-    if value is not None:
-        return force_text(value)
+def force_text_maybe(value, encoding='utf8'):
+    if is_bytes(value):
+        return value.decode(encoding, 'replace')
+    return value
 
 
 DEFAULT_MESSAGE = "An error occurred during execution"
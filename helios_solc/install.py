@@ -1,14 +1,17 @@
 """
 Install solc
 """
+import collections
 import functools
+import logging
 import os
+import shlex
+import shutil
 import stat
 import subprocess
 import sys
-import contextlib
-
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
 
 V100_5_12 = 'v100.5.12'
@@ -20,19 +23,17 @@ OSX = 'darwin'
 WINDOWS = 'win32'
 
 
+SUPPORTED_IDENTIFIERS = frozenset((V100_5_12, V100_5_15))
+SUPPORTED_PLATFORMS = frozenset((LINUX, OSX))
+
+
+logger = logging.getLogger(__name__)
+
+
 #
 # System utilities.
 #
-@contextlib.contextmanager
-def chdir(path):
-    original_path = os.getcwd()
-    try:
-        os.chdir(path)
-        yield
-    finally:
-        os.chdir(original_path)
-
-
+@functools.lru_cache(maxsize=None)
 def get_platform():
     if sys.platform.startswith('linux'):
         return LINUX
@@ -44,32 +45,25 @@ def get_platform():
         raise KeyError("Unknown platform: {0}".format(sys.platform))
 
 
-def is_executable_available(program):
-    def is_exe(fpath):
-        return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
+# Only hits are remembered so that tools installed later in the process
+# (e.g. `git` or `ninja`) are still picked up.
+_available_executables = set()
 
-    fpath = os.path.dirname(program)
-    if fpath:
-        if is_exe(program):
-            return True
-    else:
-        for path in os.environ["PATH"].split(os.pathsep):
-            path = path.strip('"')
-            exe_file = os.path.join(path, program)
-            if is_exe(exe_file):
-                return True
 
-    return False
+def is_executable_available(program):
+    if program in _available_executables:
+        return True
+    if shutil.which(program) is None:
+        return False
+    _available_executables.add(program)
+    return True
 
 
 def ensure_path_exists(dir_path):
     """
     Make sure that a path exists
     """
-    if not os.path.exists(dir_path):
-        os.makedirs(dir_path)
-        return True
-    return False
+    os.makedirs(dir_path, exist_ok=True)
 
 
 def ensure_parent_dir_exists(path):
@@ -78,8 +72,9 @@ def ensure_parent_dir_exists(path):
 
 def check_subprocess_call(command, message=None, stderr=subprocess.STDOUT, **proc_kwargs):
     if message:
-        print(message)
-    print("Executing: {0}".format(" ".join(command)))
+        logger.info(message)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Executing: %s", " ".join(shlex.quote(arg) for arg in command))
 
     return subprocess.check_call(
         command,
@@ -90,8 +85,9 @@ def check_subprocess_call(command, message=None, stderr=subprocess.STDOUT, **pro
 
 def check_subprocess_output(command, message=None, stderr=subprocess.STDOUT, **proc_kwargs):
     if message:
-        print(message)
-    print("Executing: {0}".format(" ".join(command)))
+        logger.info(message)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Executing: %s", " ".join(shlex.quote(arg) for arg in command))
 
     return subprocess.check_output(
         command,
@@ -100,9 +96,14 @@ def check_subprocess_output(command, message=None, stderr=subprocess.STDOUT, **p
     )
 
 
+def is_executable_file(path):
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
 def chmod_plus_x(executable_path):
-    current_st = os.stat(executable_path)
-    os.chmod(executable_path, current_st.st_mode | stat.S_IEXEC)
+    current_mode = os.stat(executable_path).st_mode
+    if not current_mode & stat.S_IEXEC:
+        os.chmod(executable_path, current_mode | stat.S_IEXEC)
 
 
 SOLIDITY_GIT_URI = "https://github.com/Helios-Protocol/solidity.git"
@@ -119,6 +120,17 @@ def is_git_repository(path):
 #
 #  Installation filesystem path utilities
 #
+InstallPaths = collections.namedtuple('InstallPaths', [
+    'base',
+    'repository',
+    'release_zipfile',
+    'extract',
+    'executable',
+    'build',
+    'built_executable',
+])
+
+
 def get_base_install_path(identifier):
     if 'SOLC_BASE_INSTALL_PATH' in os.environ:
         return os.path.join(
@@ -179,27 +191,54 @@ def get_built_executable_path(identifier):
     )
 
 
+def get_install_paths(identifier):
+    """
+    Compute every path used by an install in one pass.  The result is
+    built once per install and handed to each installation step.
+    """
+    base = get_base_install_path(identifier)
+    repository = os.path.join(base, 'source')
+    extract = os.path.join(base, 'bin')
+    build = os.path.join(repository, 'build')
+
+    return InstallPaths(
+        base=base,
+        repository=repository,
+        release_zipfile=os.path.join(base, 'release.zip'),
+        extract=extract,
+        executable=os.path.join(extract, 'solc'),
+        build=build,
+        built_executable=os.path.join(build, 'solc', 'solc'),
+    )
+
+
 #
 # Installation primitives.
 #
-def clone_solidity_repository(identifier):
+def clone_solidity_repository(identifier, paths):
     if not is_executable_available('git'):
         raise OSError("The `git` is required but was not found")
 
-    repository_path = get_repository_path(identifier)
+    repository_path = paths.repository
     ensure_parent_dir_exists(repository_path)
     command = [
         "git", "clone",
         "--recurse-submodules",
+        "--shallow-submodules",
+        "--jobs", str(os.cpu_count() or 4),
+        "--single-branch",
         "--branch", identifier,
-        "--depth", "10",
+        "--depth", "1",
         SOLIDITY_GIT_URI,
         repository_path,
     ]
+    # fail instead of hanging on a credentials prompt.
+    env = dict(os.environ, GIT_TERMINAL_PROMPT='0')
 
     return check_subprocess_call(
         command,
         message="Checking out solidity repository @ {0}".format(identifier),
+        env=env,
     )
 
 
@@ -214,167 +253,298 @@ def initialize_repository_submodules(identifier):
     check_subprocess_call(
         command,
         "Initializing repository submodules @ {0}".format(repository_path),
+        cwd=repository_path,
     )
 
 
 DOWNLOAD_STATIC_RELEASE_URI_TEMPLATE = "https://github.com/Helios-Protocol/solidity/releases/download/{0}/solc-static-linux"  # noqa: E501
 
-def download_static_release(identifier):
+# Seconds to wait on connect and on each read before giving up.
+DOWNLOAD_TIMEOUT = 60
+
+
+def download_static_release(identifier, paths):
+    # urllib.request pulls in http.client and email, which nothing else in
+    # the package needs, so it is only imported when downloading.
+    from urllib.error import HTTPError
+    from urllib.request import (
+        Request,
+        urlopen,
+    )
+
     download_uri = DOWNLOAD_STATIC_RELEASE_URI_TEMPLATE.format(identifier)
-    static_binary_path = get_executable_path(identifier)
+    static_binary_path = paths.executable
 
     ensure_parent_dir_exists(static_binary_path)
 
-    command = [
-        "wget", download_uri,
-        '-c',  # resume previously incomplete download.
-        '-O', static_binary_path,
-    ]
+    # resume previously incomplete download.
+    headers = {}
+    if os.path.exists(static_binary_path):
+        headers['Range'] = 'bytes={0}-'.format(os.path.getsize(static_binary_path))
 
-    return check_subprocess_call(
-        command,
-        message="Downloading static linux binary from {0}".format(download_uri),
-    )
+    logger.info("Downloading static linux binary from %s", download_uri)
+
+    try:
+        response = urlopen(Request(download_uri, headers=headers), timeout=DOWNLOAD_TIMEOUT)
+    except HTTPError as err:
+        err.close()
+        # Range not satisfiable: the previous download already completed.
+        if err.code != 416 or 'Range' not in headers:
+            raise
+    else:
+        with response:
+            # A `200` means the server ignored the `Range` header so start over.
+            mode = 'ab' if response.status == 206 else 'wb'
+            with open(static_binary_path, mode) as static_binary_file:
+                shutil.copyfileobj(response, static_binary_file, 1024 * 1024)
+
+
+def get_member_extract_path(extract_path, member):
+    extract_root = os.path.realpath(extract_path)
+    target_path = os.path.realpath(os.path.join(extract_root, member.filename))
+    if target_path != extract_root and not target_path.startswith(extract_root + os.sep):
+        raise OSError("Refusing to extract {0} outside of {1}".format(
+            member.filename,
+            extract_path,
+        ))
+    return target_path
+
+
+def extract_zipfile_member(zipfile_file, member, target_path):
+    with zipfile_file.open(member) as member_file, open(target_path, 'wb') as target_file:
+        shutil.copyfileobj(member_file, target_file, 1024 * 1024)
 
 
 def extract_release(identifier):
-    release_zipfile_path = get_release_zipfile_path(identifier)
+    paths = get_install_paths(identifier)
+    release_zipfile_path = paths.release_zipfile
 
-    extract_path = get_extract_path(identifier)
+    extract_path = paths.extract
     ensure_path_exists(extract_path)
 
-    print("Extracting zipfile: {0} -> {1}".format(release_zipfile_path, extract_path))
+    logger.info("Extracting zipfile: %s -> %s", release_zipfile_path, extract_path)
 
     with zipfile.ZipFile(release_zipfile_path) as zipfile_file:
-        zipfile_file.extractall(extract_path)
-
-    executable_path = get_executable_path(identifier)
-
-    print("Making `solc` binary executable: `chmod +x {0}`".format(executable_path))
+        file_members = []
+        for member in zipfile_file.infolist():
+            target_path = get_member_extract_path(extract_path, member)
+            if member.filename.endswith('/'):
+                ensure_path_exists(target_path)
+            else:
+                ensure_parent_dir_exists(target_path)
+                file_members.append((member, target_path))
+
+        # zlib releases the GIL while inflating so members decompress in parallel.
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            futures = [
+                executor.submit(extract_zipfile_member, zipfile_file, member, target_path)
+                for member, target_path in file_members
+            ]
+        for future in futures:
+            future.result()
+
+    executable_path = paths.executable
+
+    logger.info("Making `solc` binary executable: `chmod +x %s`", executable_path)
     chmod_plus_x(executable_path)
 
 
-def install_solc_dependencies(identifier):
-    repository_path = get_repository_path(identifier)
+def install_solc_dependencies(paths):
+    repository_path = paths.repository
     if not is_git_repository(repository_path):
         raise OSError("Git repository not found @ {0}".format(repository_path))
 
-    with chdir(repository_path):
-        install_deps_script_path = os.path.join(repository_path, 'scripts', 'install_deps.sh')
+    install_deps_script_path = os.path.join(repository_path, 'scripts', 'install_deps.sh')
 
-        return check_subprocess_call(
-            command=["sh", install_deps_script_path],
-            message="Running dependency installation script `install_deps.sh` @ {0}".format(
-                install_deps_script_path,
-            ),
-        )
+    return check_subprocess_call(
+        command=["sh", install_deps_script_path],
+        message="Running dependency installation script `install_deps.sh` @ {0}".format(
+            install_deps_script_path,
+        ),
+        cwd=repository_path,
+    )
 
 
-def install_solc_from_static_linux(identifier):
-    download_static_release(identifier)
+def install_solc_from_static_linux(identifier, paths):
+    download_static_release(identifier, paths)
 
-    executable_path = get_executable_path(identifier)
+    executable_path = paths.executable
     chmod_plus_x(executable_path)
 
     check_version_command = [executable_path, '--version']
 
-    check_subprocess_output(
+    # Only the exit status matters; stderr is merged into the discarded stdout.
+    check_subprocess_call(
         check_version_command,
         message="Checking installed executable version @ {0}".format(executable_path),
+        stdout=subprocess.DEVNULL,
     )
 
-    print("solc successfully installed at: {0}".format(executable_path))
+    logger.info("solc successfully installed at: %s", executable_path)
 
 
-def build_solc_from_source(identifier):
-    if not is_git_repository(get_repository_path(identifier)):
-        clone_solidity_repository(identifier)
+def build_solc_from_source(identifier, paths, jobs=None):
+    built_executable_path = paths.built_executable
 
-    build_dir = get_build_dir(identifier)
-    ensure_path_exists(build_dir)
+    if is_executable_file(built_executable_path):
+        logger.info("Found existing build @ %s, skipping compilation", built_executable_path)
+    else:
+        compile_solc(identifier, paths, jobs)
+        chmod_plus_x(built_executable_path)
 
-    with chdir(build_dir):
-        cmake_command = ["cmake", ".."]
-        check_subprocess_call(
-            cmake_command,
-            message="Running cmake build command",
-        )
-        make_command = ["make"]
-        check_subprocess_call(
-            make_command,
-            message="Running make command",
-        )
+    executable_path = paths.executable
+    ensure_parent_dir_exists(executable_path)
+    if not os.path.lexists(executable_path):
+        os.symlink(built_executable_path, executable_path)
 
-    built_executable_path = get_built_executable_path(identifier)
-    chmod_plus_x(built_executable_path)
 
-    executable_path = get_executable_path(identifier)
-    ensure_parent_dir_exists(executable_path)
-    os.symlink(built_executable_path, executable_path)
-    chmod_plus_x(executable_path)
+def get_configured_cmake_generator(build_dir):
+    cmake_cache_path = os.path.join(build_dir, 'CMakeCache.txt')
+    if not os.path.exists(cmake_cache_path):
+        return None
 
+    with open(cmake_cache_path) as cmake_cache_file:
+        for line in cmake_cache_file:
+            if line.startswith('CMAKE_GENERATOR:'):
+                return line.partition('=')[2].strip()
+    return None
 
 
-def install_from_static_linux(identifier):
-    install_solc_from_static_linux(identifier)
+def compile_solc(identifier, paths, jobs=None):
+    if not is_git_repository(paths.repository):
+        clone_solidity_repository(identifier, paths)
 
-    executable_path = get_executable_path(identifier)
-    print("Succesfully installed solc @ `{0}`".format(executable_path))
+    build_dir = paths.build
+    ensure_path_exists(build_dir)
 
+    configured_generator = get_configured_cmake_generator(build_dir)
+    if configured_generator is None:
+        use_ninja = is_executable_available('ninja')
+    else:
+        # cmake refuses to switch generators in an already configured build dir.
+        use_ninja = configured_generator == 'Ninja'
 
-install_v100_5_12_linux = functools.partial(install_solc_from_static_linux, V100_5_12)
-install_v100_5_15_linux = functools.partial(install_solc_from_static_linux, V100_5_15)
+    jobs = str(jobs or os.cpu_count() or 1)
+    if use_ninja:
+        cmake_command = ["cmake", "..", "-GNinja"]
+        make_command = ["ninja", "-j", jobs]
+    else:
+        cmake_command = ["cmake", ".."]
+        make_command = ["make", "-j{0}".format(jobs)]
 
+    check_subprocess_call(
+        cmake_command,
+        message="Running cmake build command",
+        cwd=build_dir,
+    )
+    check_subprocess_call(
+        make_command,
+        message="Running {0} command".format(make_command[0]),
+        cwd=build_dir,
+    )
 
-def install_from_source(identifier):
-    if not is_git_repository(get_repository_path(identifier)):
-        clone_solidity_repository(identifier)
-    install_solc_dependencies(identifier)
-    build_solc_from_source(identifier)
 
-    executable_path = get_executable_path(identifier)
-    print("Succesfully installed solc @ `{0}`".format(executable_path))
+def install_from_static_linux(identifier, paths):
+    install_solc_from_static_linux(identifier, paths)
 
+    logger.info("Succesfully installed solc @ `%s`", paths.executable)
 
-install_v100_5_12_osx = functools.partial(install_from_source, V100_5_12)
-install_v100_5_15_osx = functools.partial(install_from_source, V100_5_15)
 
+def prepare_source_build(identifier, paths):
+    if not is_git_repository(paths.repository):
+        clone_solidity_repository(identifier, paths)
+    install_solc_dependencies(paths)
 
-INSTALL_FUNCTIONS = {
-    LINUX: {
 
-        V100_5_12: install_v100_5_12_linux,
-        V100_5_15: install_v100_5_15_linux,
-    },
-    OSX: {
-        V100_5_12: install_v100_5_12_osx,
-        V100_5_15: install_v100_5_15_osx,
-    }
-}
+def install_from_source(identifier, paths):
+    executable_path = paths.executable
+    if is_executable_file(executable_path):
+        logger.info("solc already installed @ `%s`", executable_path)
+        return
 
+    prepare_source_build(identifier, paths)
+    build_solc_from_source(identifier, paths)
+
+    logger.info("Succesfully installed solc @ `%s`", executable_path)
 
-def install_solc(identifier, platform=None):
-    if platform is None:
-        platform = get_platform()
 
-    if platform not in INSTALL_FUNCTIONS:
+def validate_installation(identifier, platform):
+    if identifier not in SUPPORTED_IDENTIFIERS:
         raise ValueError(
-            "Installation of solidity is not supported on your platform ({0}). "
-            "Supported platforms are: {1}".format(
-                platform,
-                ', '.join(sorted(INSTALL_FUNCTIONS.keys())),
+            "Installation of solidity=={0} is not supported.  Must be one of {1}".format(
+                identifier,
+                ', '.join(sorted(SUPPORTED_IDENTIFIERS)),
             )
         )
-    elif identifier not in INSTALL_FUNCTIONS[platform]:
+    elif platform not in SUPPORTED_PLATFORMS:
         raise ValueError(
-            "Installation of solidity=={0} is not supported.  Must be one of {1}".format(
-                identifier,
-                ', '.join(sorted(INSTALL_FUNCTIONS[platform].keys())),
+            "Installation of solidity is not supported on your platform ({0}). "
+            "Supported platforms are: {1}".format(
+                platform,
+                ', '.join(sorted(SUPPORTED_PLATFORMS)),
             )
         )
 
-    install_fn = INSTALL_FUNCTIONS[platform][identifier]
-    install_fn()
+
+def install_solc(identifier, platform=None):
+    if platform is None:
+        platform = get_platform()
+
+    validate_installation(identifier, platform)
+    paths = get_install_paths(identifier)
+
+    if platform == LINUX:
+        install_solc_from_static_linux(identifier, paths)
+    else:
+        install_from_source(identifier, paths)
+
+
+def install_solc_many(identifiers, platform=None, jobs=None):
+    """
+    Install several solc versions concurrently.
+
+    Static releases are downloaded with one worker per core by default.
+    Source builds default to a single worker, and the cores are split
+    between workers since each build already runs a parallel make.
+    """
+    if platform is None:
+        platform = get_platform()
+
+    # Two workers for the same identifier would write the same executable.
+    identifiers = list(collections.OrderedDict.fromkeys(identifiers))
+    for identifier in identifiers:
+        validate_installation(identifier, platform)
+
+    cpu_count = os.cpu_count() or 1
+    if platform == LINUX:
+        if jobs is None:
+            jobs = cpu_count
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(functools.partial(install_solc, platform=platform), identifiers))
+        return
+
+    if jobs is None:
+        jobs = 1
+    build_jobs = max(1, cpu_count // jobs)
+
+    pending_installs = []
+    for identifier in identifiers:
+        paths = get_install_paths(identifier)
+        if not is_executable_file(paths.executable):
+            pending_installs.append((identifier, paths))
+
+    # `install_deps.sh` goes through the system package manager, which
+    # does not allow concurrent runs.
+    for identifier, paths in pending_installs:
+        prepare_source_build(identifier, paths)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(build_solc_from_source, identifier, paths, build_jobs)
+            for identifier, paths in pending_installs
+        ]
+    for future in futures:
+        future.result()
 
 
 if __name__ == "__main__":
@@ -384,4 +554,5 @@ if __name__ == "__main__":
         print("Invocation error.  Should be invoked as `./install_solc.py <release-tag>`")
         sys.exit(1)
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     install_solc(identifier)
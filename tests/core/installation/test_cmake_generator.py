@@ -0,0 +1,16 @@
+from helios_solc.install import (
+    get_configured_cmake_generator,
+)
+
+
+def test_unconfigured_build_dir(tmpdir):
+    assert get_configured_cmake_generator(str(tmpdir)) is None
+
+
+def test_generator_is_read_from_cmake_cache(tmpdir):
+    tmpdir.join('CMakeCache.txt').write(
+        "# This is the CMakeCache file.\n"
+        "CMAKE_BUILD_TYPE:STRING=Release\n"
+        "CMAKE_GENERATOR:INTERNAL=Unix Makefiles\n"
+    )
+    assert get_configured_cmake_generator(str(tmpdir)) == 'Unix Makefiles'
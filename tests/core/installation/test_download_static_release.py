@@ -0,0 +1,103 @@
+import io
+import os
+from urllib.error import HTTPError
+
+import pytest
+
+from helios_solc.install import (
+    DOWNLOAD_TIMEOUT,
+    V100_5_12,
+    download_static_release,
+    get_executable_path,
+    get_install_paths,
+)
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, body, status):
+        super().__init__(body)
+        self.status = status
+
+
+@pytest.fixture()
+def requests(monkeypatch, tmpdir):
+    monkeypatch.setenv('SOLC_BASE_INSTALL_PATH', str(tmpdir))
+    return []
+
+
+def patch_urlopen(monkeypatch, requests, body=None, status=200, error_code=None):
+    def urlopen(request, timeout=None):
+        assert timeout == DOWNLOAD_TIMEOUT
+        requests.append(request)
+        if error_code is not None:
+            raise HTTPError(request.full_url, error_code, 'error', {}, None)
+        return FakeResponse(body, status)
+
+    monkeypatch.setattr('urllib.request.urlopen', urlopen)
+
+
+def write_binary(contents):
+    binary_path = get_executable_path(V100_5_12)
+    os.makedirs(os.path.dirname(binary_path))
+    with open(binary_path, 'wb') as binary_file:
+        binary_file.write(contents)
+
+
+def read_binary():
+    with open(get_executable_path(V100_5_12), 'rb') as binary_file:
+        return binary_file.read()
+
+
+def test_fresh_download(monkeypatch, requests):
+    patch_urlopen(monkeypatch, requests, b'solc-binary', 200)
+
+    download_static_release(V100_5_12, get_install_paths(V100_5_12))
+
+    assert requests[0].get_header('Range') is None
+    assert read_binary() == b'solc-binary'
+
+
+def test_partial_content_is_appended(monkeypatch, requests):
+    write_binary(b'solc-')
+    patch_urlopen(monkeypatch, requests, b'binary', 206)
+
+    download_static_release(V100_5_12, get_install_paths(V100_5_12))
+
+    assert requests[0].get_header('Range') == 'bytes=5-'
+    assert read_binary() == b'solc-binary'
+
+
+def test_ignored_range_restarts_download(monkeypatch, requests):
+    write_binary(b'stale')
+    patch_urlopen(monkeypatch, requests, b'solc-binary', 200)
+
+    download_static_release(V100_5_12, get_install_paths(V100_5_12))
+
+    assert requests[0].get_header('Range') == 'bytes=5-'
+    assert read_binary() == b'solc-binary'
+
+
+def test_unsatisfiable_range_keeps_completed_download(monkeypatch, requests):
+    write_binary(b'solc-binary')
+    patch_urlopen(monkeypatch, requests, error_code=416)
+
+    download_static_release(V100_5_12, get_install_paths(V100_5_12))
+
+    assert requests[0].get_header('Range') == 'bytes=11-'
+    assert read_binary() == b'solc-binary'
+
+
+def test_unsatisfiable_range_without_resume_is_raised(monkeypatch, requests):
+    patch_urlopen(monkeypatch, requests, error_code=416)
+
+    with pytest.raises(HTTPError):
+        download_static_release(V100_5_12, get_install_paths(V100_5_12))
+
+    assert requests[0].get_header('Range') is None
+
+
+def test_other_http_errors_are_raised(monkeypatch, requests):
+    patch_urlopen(monkeypatch, requests, error_code=404)
+
+    with pytest.raises(HTTPError):
+        download_static_release(V100_5_12, get_install_paths(V100_5_12))
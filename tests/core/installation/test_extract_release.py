@@ -0,0 +1,51 @@
+import os
+import zipfile
+
+import pytest
+
+from helios_solc.install import (
+    V100_5_12,
+    extract_release,
+    get_executable_path,
+    get_extract_path,
+    get_release_zipfile_path,
+)
+
+
+@pytest.fixture()
+def release_zipfile_path(monkeypatch, tmpdir):
+    monkeypatch.setenv('SOLC_BASE_INSTALL_PATH', str(tmpdir))
+    release_zipfile_path = get_release_zipfile_path(V100_5_12)
+    os.makedirs(os.path.dirname(release_zipfile_path))
+    return release_zipfile_path
+
+
+def test_extract_release(release_zipfile_path):
+    with zipfile.ZipFile(release_zipfile_path, 'w', zipfile.ZIP_DEFLATED) as release_zipfile:
+        release_zipfile.writestr('./', '')
+        release_zipfile.writestr('solc', 'solc-binary' * 1000)
+        release_zipfile.writestr('lib/', '')
+        release_zipfile.writestr('lib/libsolidity.so', 'shared-library')
+
+    extract_release(V100_5_12)
+
+    executable_path = get_executable_path(V100_5_12)
+    with open(executable_path) as executable_file:
+        assert executable_file.read() == 'solc-binary' * 1000
+    assert os.access(executable_path, os.X_OK)
+
+    library_path = os.path.join(get_extract_path(V100_5_12), 'lib', 'libsolidity.so')
+    with open(library_path) as library_file:
+        assert library_file.read() == 'shared-library'
+
+
+def test_extract_release_rejects_members_outside_extract_path(release_zipfile_path):
+    with zipfile.ZipFile(release_zipfile_path, 'w') as release_zipfile:
+        release_zipfile.writestr('solc', 'solc-binary')
+        release_zipfile.writestr('../evil', 'evil')
+
+    with pytest.raises(OSError, match="Refusing to extract"):
+        extract_release(V100_5_12)
+
+    evil_path = os.path.join(os.path.dirname(get_extract_path(V100_5_12)), 'evil')
+    assert not os.path.exists(evil_path)
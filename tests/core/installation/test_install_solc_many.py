@@ -0,0 +1,52 @@
+import threading
+
+from helios_solc import install
+from helios_solc.install import (
+    LINUX,
+    OSX,
+    V100_5_12,
+    V100_5_15,
+    get_install_paths,
+    install_solc_many,
+)
+
+
+def test_install_solc_many_dispatches_each_identifier_once(monkeypatch):
+    lock = threading.Lock()
+    installed = []
+
+    def install_solc(identifier, platform=None):
+        with lock:
+            installed.append((identifier, platform))
+
+    monkeypatch.setattr(install, 'install_solc', install_solc)
+
+    install_solc_many([V100_5_12, V100_5_15, V100_5_12], platform=LINUX, jobs=2)
+
+    assert sorted(installed) == [(V100_5_12, LINUX), (V100_5_15, LINUX)]
+
+
+def test_install_solc_many_prepares_source_builds_serially(monkeypatch, tmpdir):
+    monkeypatch.setenv('SOLC_BASE_INSTALL_PATH', str(tmpdir))
+    monkeypatch.setattr(install.os, 'cpu_count', lambda: 4)
+
+    lock = threading.Lock()
+    prepared = []
+    built = []
+
+    def prepare_source_build(identifier, paths):
+        assert paths == get_install_paths(identifier)
+        prepared.append(identifier)
+
+    def build_solc_from_source(identifier, paths, jobs=None):
+        assert paths == get_install_paths(identifier)
+        with lock:
+            built.append((identifier, jobs))
+
+    monkeypatch.setattr(install, 'prepare_source_build', prepare_source_build)
+    monkeypatch.setattr(install, 'build_solc_from_source', build_solc_from_source)
+
+    install_solc_many([V100_5_12, V100_5_15, V100_5_15], platform=OSX, jobs=2)
+
+    assert prepared == [V100_5_12, V100_5_15]
+    assert sorted(built) == [(V100_5_12, 2), (V100_5_15, 2)]
@@ -0,0 +1,20 @@
+import pytest
+
+from helios_solc.exceptions import (
+    force_text_maybe,
+)
+
+
+@pytest.mark.parametrize(
+    'value,expected',
+    (
+        (b'contract Foo {}', 'contract Foo {}'),
+        (bytearray(b'contract Foo {}'), 'contract Foo {}'),
+        ('✓ ok'.encode('utf8'), '✓ ok'),
+        (b'bad \xff byte', 'bad � byte'),
+        ('already text', 'already text'),
+        (None, None),
+    ),
+)
+def test_force_text_maybe(value, expected):
+    assert force_text_maybe(value, 'utf8') == expected
@@ -8,7 +8,8 @@ from solc import (
     get_solc_version,
 )
 from solc.install import (
-    INSTALL_FUNCTIONS,
+    SUPPORTED_IDENTIFIERS,
+    SUPPORTED_PLATFORMS,
     get_platform,
     install_solc,
     get_executable_path,
@@ -18,8 +19,8 @@ from solc.install import (
 
 INSTALLATION_TEST_PARAMS = tuple(
     (platform, version)
-    for platform, platform_install_functions in INSTALL_FUNCTIONS.items()
-    for version in platform_install_functions.keys()
+    for platform in sorted(SUPPORTED_PLATFORMS)
+    for version in sorted(SUPPORTED_IDENTIFIERS)
 )
 
 